@@ -3,6 +3,7 @@
 // and first-time merchants.
 
 import type { Transaction } from "./spending.js";
+import { compareIso, epochDay } from "./dates.js";
 
 export interface Anomaly {
   type: "unusual_amount" | "duplicate" | "new_merchant" | "frequency_change";
@@ -80,19 +81,23 @@ export function detectAnomalies(
   }
 
   // ── 3. Potential duplicates ───────────────────────────────────────
-  const sorted = [...transactions].sort((a, b) => a.date.localeCompare(b.date));
+  // Normalize each merchant and parse each date once, not once per pair
+  const sorted = [...transactions]
+    .sort((a, b) => compareIso(a.date, b.date))
+    .map((tx) => ({ tx, day: epochDay(tx.date), merchant: normalizeMerchant(tx.merchant) }));
 
   for (let i = 0; i < sorted.length; i++) {
-    const tx = sorted[i]!;
+    const { tx, day, merchant } = sorted[i]!;
     for (let j = i + 1; j < sorted.length; j++) {
-      const other = sorted[j]!;
+      const next = sorted[j]!;
+      const other = next.tx;
 
       // Once we're past the window, stop inner loop
-      if (daysBetween(tx.date, other.date) > duplicateWindowDays) break;
+      if (next.day - day > duplicateWindowDays) break;
 
       if (
         tx.id !== other.id &&
-        normalizeMerchant(tx.merchant) === normalizeMerchant(other.merchant) &&
+        merchant === next.merchant &&
         tx.amount === other.amount
       ) {
         anomalies.push({
@@ -144,7 +149,7 @@ export function detectAnomalies(
     const sevOrder = { high: 0, medium: 1, low: 2 };
     const sevDiff = sevOrder[a.severity] - sevOrder[b.severity];
     if (sevDiff !== 0) return sevDiff;
-    return b.transaction.date.localeCompare(a.transaction.date);
+    return compareIso(b.transaction.date, a.transaction.date);
   });
 
   return anomalies;
@@ -195,12 +200,6 @@ function normalizeMerchant(merchant: string): string {
   return merchant.trim().toLowerCase();
 }
 
-function daysBetween(a: string, b: string): number {
-  const msPerDay = 86_400_000;
-  const diff = Math.abs(new Date(b).getTime() - new Date(a).getTime());
-  return Math.round(diff / msPerDay);
-}
-
 function severityFromMultiplier(multiplier: number): Anomaly["severity"] {
   if (multiplier >= 4) return "high";
   if (multiplier >= 3) return "medium";
@@ -0,0 +1,37 @@
+import { describe, expect, test } from "bun:test";
+import { compareIso, daysBetween, epochDay } from "./dates.js";
+
+describe("epochDay", () => {
+  test("matches Date parsing for ISO dates", () => {
+    for (const date of ["1970-01-01", "2024-02-29", "2025-03-09", "2025-12-31"]) {
+      expect(epochDay(date)).toBe(new Date(date).getTime() / 86_400_000);
+    }
+  });
+
+  test("rejects anything that is not exactly YYYY-MM-DD", () => {
+    for (const date of ["2025-01-15T23:59:59Z", "2025-1-5", "2025-01", "", "not-a-date"]) {
+      expect(() => epochDay(date)).toThrow("expected YYYY-MM-DD");
+    }
+  });
+});
+
+describe("daysBetween", () => {
+  test("counts whole days regardless of order", () => {
+    expect(daysBetween("2025-01-01", "2025-01-31")).toBe(30);
+    expect(daysBetween("2025-01-31", "2025-01-01")).toBe(30);
+  });
+
+  test("spans leap days and year boundaries", () => {
+    expect(daysBetween("2024-02-28", "2024-03-01")).toBe(2);
+    expect(daysBetween("2024-12-31", "2025-01-01")).toBe(1);
+  });
+});
+
+describe("compareIso", () => {
+  test("orders dates and periods chronologically", () => {
+    const dates = ["2025-02-01", "2024-12-31", "2025-01-15"];
+    expect([...dates].sort(compareIso)).toEqual(["2024-12-31", "2025-01-15", "2025-02-01"]);
+    expect(compareIso("2025-01", "2025-01")).toBe(0);
+    expect(compareIso("2025-02", "2025-01")).toBeGreaterThan(0);
+  });
+});
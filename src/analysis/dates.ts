@@ -0,0 +1,33 @@
+// ── Date Helpers ────────────────────────────────────────────────────
+// Shared YYYY-MM-DD arithmetic for the analysis modules. Dates arrive as
+// fixed-width ISO strings, so the fields are read by position instead of
+// going through the Date string parser.
+
+const MS_PER_DAY = 86_400_000;
+const ISO_DATE = /^\d{4}-\d{2}-\d{2}$/;
+
+/** Days since the Unix epoch for a YYYY-MM-DD date. Throws on any other format. */
+export function epochDay(date: string): number {
+  // Slicing by position would silently turn a malformed date into NaN
+  if (!ISO_DATE.test(date)) {
+    throw new Error(`Invalid date "${date}": expected YYYY-MM-DD`);
+  }
+  const year = Number(date.slice(0, 4));
+  const month = Number(date.slice(5, 7));
+  const day = Number(date.slice(8, 10));
+  return Date.UTC(year, month - 1, day) / MS_PER_DAY;
+}
+
+/** Absolute number of whole days between two YYYY-MM-DD dates */
+export function daysBetween(a: string, b: string): number {
+  return Math.abs(epochDay(b) - epochDay(a));
+}
+
+/**
+ * Ordinal comparator for ISO dates and periods (YYYY-MM-DD, YYYY-MM).
+ * Fixed-width ISO strings sort chronologically by code unit, so no
+ * locale-aware collation is needed.
+ */
+export function compareIso(a: string, b: string): number {
+  return a < b ? -1 : a > b ? 1 : 0;
+}
@@ -4,6 +4,7 @@
 // net-worth trend.
 
 import type { Transaction } from "./spending.js";
+import { compareIso, daysBetween } from "./dates.js";
 
 export interface HealthScore {
   overall: number; // 0-100
@@ -316,7 +317,7 @@ function scoreNetWorthTrend(history: NetWorthPoint[]): ComponentScore {
     };
   }
 
-  const sorted = [...history].sort((a, b) => a.date.localeCompare(b.date));
+  const sorted = [...history].sort((a, b) => compareIso(a.date, b.date));
   const first = sorted[0]!.netWorth;
   const last = sorted[sorted.length - 1]!.netWorth;
 
@@ -410,13 +411,6 @@ function clamp(value: number, min: number, max: number): number {
   return Math.min(max, Math.max(min, value));
 }
 
-function daysBetween(a: string, b: string): number {
-  const msPerDay = 86_400_000;
-  return Math.round(
-    Math.abs(new Date(b).getTime() - new Date(a).getTime()) / msPerDay,
-  );
-}
-
 function round(n: number): number {
   return Math.round(n * 100) / 100;
 }
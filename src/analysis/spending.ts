@@ -1,6 +1,8 @@
 // ── Spending Analysis ───────────────────────────────────────────────
 // Pure functions that compute spending breakdowns from raw transactions.
 
+import { epochDay } from "./dates.js";
+
 export interface SpendingBreakdown {
   category: string;
   amount: number;
@@ -110,7 +112,7 @@ export function analyzeSpending(
   const topCategories = breakdowns.slice(0, topN);
 
   // ── Daily average ─────────────────────────────────────────────────
-  const days = daysBetween(period.start, period.end);
+  const days = inclusiveDayCount(period.start, period.end);
   const dailyAverage = days > 0 ? round(totalSpending / days) : round(totalSpending);
 
   // ── Prior period comparison ───────────────────────────────────────
@@ -178,10 +180,9 @@ function derivePeriod(
   return { start: start ?? minDate, end: end ?? maxDate };
 }
 
-function daysBetween(a: string, b: string): number {
-  const msPerDay = 86_400_000;
-  const diff = new Date(b).getTime() - new Date(a).getTime();
-  return Math.max(1, Math.round(diff / msPerDay) + 1); // inclusive
+/** Days in the period counting both ends, never less than 1 */
+function inclusiveDayCount(start: string, end: string): number {
+  return Math.max(1, epochDay(end) - epochDay(start) + 1);
 }
 
 function round(n: number): number {
@@ -2,6 +2,8 @@
 // Detects recurring payment patterns, estimates frequency, computes
 // annual cost, and flags price changes.
 
+import { compareIso, daysBetween } from "./dates.js";
+
 export interface Subscription {
   merchant: string;
   amount: number;
@@ -74,7 +76,7 @@ export function analyzeSubscriptions(
 
   for (const [, group] of merchantGroups) {
     // Sort chronologically
-    const sorted = [...group].sort((a, b) => a.date.localeCompare(b.date));
+    const sorted = [...group].sort((a, b) => compareIso(a.date, b.date));
 
     // Use the display name from the most recent transaction
     const displayMerchant = sorted[sorted.length - 1]!.merchant;
@@ -220,13 +222,6 @@ function advanceDate(dateStr: string, frequency: Subscription["frequency"]): str
   return formatDate(d);
 }
 
-function daysBetween(a: string, b: string): number {
-  const msPerDay = 86_400_000;
-  return Math.round(
-    Math.abs(new Date(b).getTime() - new Date(a).getTime()) / msPerDay,
-  );
-}
-
 function normalizeMerchant(merchant: string): string {
   return merchant.trim().toLowerCase();
 }
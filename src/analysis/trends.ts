@@ -3,6 +3,7 @@
 // to determine whether spending is increasing, decreasing, or stable.
 
 import type { Transaction } from "./spending.js";
+import { compareIso } from "./dates.js";
 
 export interface TrendPoint {
   period: string; // "YYYY-MM"
@@ -42,25 +43,21 @@ export function detectTrends(
   const minMonths = options.minMonths ?? 3;
   const stableThreshold = options.stableThreshold ?? 5;
 
-  // ── Filter ────────────────────────────────────────────────────────
-  let filtered = transactions.filter((tx) => tx.amount < 0);
-  if (options.startDate) {
-    filtered = filtered.filter((tx) => tx.date >= options.startDate!);
-  }
-  if (options.endDate) {
-    filtered = filtered.filter((tx) => tx.date <= options.endDate!);
-  }
-  if (options.categories && options.categories.length > 0) {
-    const catSet = new Set(options.categories);
-    filtered = filtered.filter((tx) => catSet.has(tx.category?.name ?? "Uncategorized"));
-  }
-
-  if (filtered.length === 0) return [];
-
-  // ── Group by category -> month -> total ───────────────────────────
+  // ── Filter and group by category -> month -> total ────────────────
+  // One pass over the input instead of a chain of filtered copies
+  const { startDate, endDate } = options;
+  const catSet =
+    options.categories && options.categories.length > 0
+      ? new Set(options.categories)
+      : null;
   const categoryMonths = new Map<string, Map<string, number>>();
 
-  for (const tx of filtered) {
+  for (const tx of transactions) {
+    if (tx.amount >= 0) continue;
+    if (startDate && tx.date < startDate) continue;
+    if (endDate && tx.date > endDate) continue;
+    if (catSet && !catSet.has(tx.category?.name ?? "Uncategorized")) continue;
+
     const cat = tx.category?.name || "Uncategorized";
     const month = tx.date.slice(0, 7); // "YYYY-MM"
 
@@ -74,6 +71,8 @@ export function detectTrends(
     monthMap.set(month, current + Math.abs(tx.amount));
   }
 
+  if (categoryMonths.size === 0) return [];
+
   // ── Compute trends ────────────────────────────────────────────────
   const trends: Trend[] = [];
 
@@ -83,7 +82,7 @@ export function detectTrends(
     for (const [period, amount] of monthMap) {
       dataPoints.push({ period, amount: round(amount) });
     }
-    dataPoints.sort((a, b) => a.period.localeCompare(b.period));
+    dataPoints.sort((a, b) => compareIso(a.period, b.period));
 
     if (dataPoints.length < minMonths) continue;
 
@@ -35,7 +35,10 @@ export function loadConfig(): Config {
       corsOrigins: (
         process.env.CORS_ORIGINS ||
         "https://claude.ai,https://www.claude.ai,https://claude.com"
-      ).split(","),
+      )
+        .split(",")
+        .map((origin) => origin.trim())
+        .filter(Boolean),
     },
     oauth: {
       clientId: process.env.OAUTH_CLIENT_ID || "",
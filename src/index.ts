@@ -43,28 +43,36 @@ async function startStdio() {
 async function startHttp() {
   const { Hono } = await import("hono");
   const { cors } = await import("hono/cors");
-  const { logger } = await import("hono/logger");
   const { WebStandardStreamableHTTPServerTransport } = await import(
     "@modelcontextprotocol/sdk/server/webStandardStreamableHttp.js"
   );
   const { oauthRouter } = await import("./oauth/routes.js");
-  const { initTokenStore, cleanupExpired } = await import(
+  const { initTokenStore, cleanupExpired, sweepExpired } = await import(
     "./oauth/store.js"
   );
   const { rateLimit } = await import("./middleware/rate-limit.js");
   const { auditLog } = await import("./middleware/audit.js");
 
-  // Initialize token store
+  // Initialize token store and sweep rows that expired while the machine was stopped
   initTokenStore(config.dbPath);
+  cleanupExpired();
 
   const app = new Hono();
 
+  // Exact-match lookup for the Origin header, built once
+  const allowedOrigins = new Set(config.server.corsOrigins);
+
   // ── Middleware ──
-  app.use(logger());
-  app.use(auditLog());
+  // The audit log already emits one line per request; hono's logger adds an
+  // unstructured pair of lines on top, so keep it for debugging only
+  if (config.logLevel === "debug") {
+    const { logger } = await import("hono/logger");
+    app.use(logger());
+  }
+  app.use(auditLog({ level: config.logLevel }));
   app.use(
     cors({
-      origin: config.server.corsOrigins,
+      origin: (origin) => (allowedOrigins.has(origin) ? origin : null),
       allowMethods: ["GET", "POST", "DELETE", "OPTIONS"],
       allowHeaders: [
         "Content-Type",
@@ -77,17 +85,19 @@ async function startHttp() {
         "X-RateLimit-Limit",
         "X-RateLimit-Remaining",
       ],
+      // Let browsers cache preflight results instead of sending OPTIONS per call
+      maxAge: 86_400,
     })
   );
 
   // ── Health check ──
-  app.get("/health", (c) =>
-    c.json({
-      status: "ok",
-      server: "monarch-money-mcp",
-      version: "0.1.0-alpha.1",
-    })
-  );
+  // Static payload — built once instead of on every probe
+  const health = {
+    status: "ok",
+    server: "monarch-money-mcp",
+    version: "0.1.0-alpha.1",
+  } as const;
+  app.get("/health", (c) => c.json(health));
 
   // ── OAuth routes ──
   app.route("/", oauthRouter);
@@ -96,9 +106,9 @@ async function startHttp() {
   type TransportInstance = InstanceType<typeof WebStandardStreamableHTTPServerTransport>;
   const sessions = new Map<string, TransportInstance>();
 
-  // Clean up stale sessions + expired tokens every 5 minutes
+  // Sweep expired auth codes + tokens every 5 minutes, yielding between batches
   setInterval(() => {
-    cleanupExpired();
+    sweepExpired().catch((err) => console.error("Token cleanup failed:", err));
   }, 5 * 60_000);
 
   // Handle all MCP methods (POST, GET for SSE, DELETE for session termination)
@@ -111,6 +121,23 @@ async function startHttp() {
       return transport.handleRequest(c.req.raw);
     }
 
+    // Unknown session (e.g. lost on a machine restart) — 404 tells the client to re-initialize
+    if (sessionId) {
+      return c.json(
+        { jsonrpc: "2.0", error: { code: -32001, message: "Session not found" }, id: null },
+        404
+      );
+    }
+
+    // Only a POST can open a session — reject anything else before building a server
+    if (c.req.method !== "POST") {
+      c.header("Allow", "POST");
+      return c.json(
+        { jsonrpc: "2.0", error: { code: -32000, message: "Method not allowed." }, id: null },
+        405
+      );
+    }
+
     // New session — create transport + MCP server
     const transport = new WebStandardStreamableHTTPServerTransport({
       sessionIdGenerator: () => crypto.randomUUID(),
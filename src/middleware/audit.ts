@@ -1,34 +1,42 @@
 import type { MiddlewareHandler } from "hono";
 
+const LEVELS: Record<string, number> = { debug: 10, info: 20, warn: 30, error: 40 };
+
 /**
  * Structured audit logging middleware.
  *
  * Emits one JSON log line per request with timing, status, method, path,
  * and client IP. Logs are written to stdout for easy ingestion by external
- * log aggregators (Fly.io, Datadog, etc.).
+ * log aggregators (Fly.io, Datadog, etc.). Requests whose level falls below
+ * the configured threshold are not formatted at all.
  */
-export function auditLog(): MiddlewareHandler {
+export function auditLog(
+  options: { level?: string } = {}
+): MiddlewareHandler {
+  const threshold = LEVELS[options.level ?? "info"] ?? LEVELS.info!;
+
   return async (c, next) => {
     const start = Date.now();
-    const method = c.req.method;
-    const path = c.req.path;
+
+    await next();
+
+    const status = c.res.status;
+    const level = status >= 500 ? "error" : status >= 400 ? "warn" : "info";
+    if (LEVELS[level]! < threshold) return;
+
+    const duration = Date.now() - start;
     const ip =
       c.req.header("x-forwarded-for")?.split(",")[0]?.trim() ||
       c.req.header("x-real-ip") ||
       "unknown";
     const userAgent = c.req.header("user-agent") || "unknown";
 
-    await next();
-
-    const duration = Date.now() - start;
-    const status = c.res.status;
-
     console.log(
       JSON.stringify({
         timestamp: new Date().toISOString(),
-        level: status >= 500 ? "error" : status >= 400 ? "warn" : "info",
-        method,
-        path,
+        level,
+        method: c.req.method,
+        path: c.req.path,
         status,
         duration,
         ip,
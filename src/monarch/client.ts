@@ -1,7 +1,14 @@
 import { MonarchClient } from "monarchmoney";
 
+/** How long a validated session is trusted before asking Monarch again */
+const SESSION_CHECK_INTERVAL_MS = 5 * 60_000;
+
+/** Errors the monarchmoney SDK raises when the session is missing, expired or revoked */
+const AUTH_ERROR_NAMES = new Set(["MonarchAuthError", "MonarchSessionExpiredError"]);
+
 let clientInstance: MonarchClient | null = null;
 let loginPromise: Promise<MonarchClient> | null = null;
+let lastValidatedAt = 0;
 
 /**
  * Get an authenticated MonarchMoney client (singleton).
@@ -9,10 +16,18 @@ let loginPromise: Promise<MonarchClient> | null = null;
  */
 export async function getMonarchClient(): Promise<MonarchClient> {
   if (clientInstance) {
+    // Skip the validation round trip while the last check is recent
+    if (Date.now() - lastValidatedAt < SESSION_CHECK_INTERVAL_MS) {
+      return clientInstance;
+    }
+
     // Validate existing session is still good
     try {
       const valid = await clientInstance.validateSession();
-      if (valid) return clientInstance;
+      if (valid) {
+        lastValidatedAt = Date.now();
+        return clientInstance;
+      }
     } catch {
       // Session expired — re-login
       clientInstance = null;
@@ -25,12 +40,50 @@ export async function getMonarchClient(): Promise<MonarchClient> {
   loginPromise = createClient();
   try {
     clientInstance = await loginPromise;
+    lastValidatedAt = Date.now();
     return clientInstance;
   } finally {
     loginPromise = null;
   }
 }
 
+/**
+ * Run Monarch calls with the shared client. The session check above is
+ * throttled, so a session that Monarch expired or revoked in between only
+ * surfaces as an auth error here — force a fresh check (re-login if needed)
+ * and retry once.
+ */
+export async function withMonarchClient<T>(
+  fn: (client: MonarchClient) => Promise<T>
+): Promise<T> {
+  const client = await getMonarchClient();
+  try {
+    return await fn(client);
+  } catch (error) {
+    if (!isAuthError(error)) throw error;
+    markMonarchSessionSuspect();
+    return fn(await getMonarchClient());
+  }
+}
+
+/** Make the next getMonarchClient() call re-validate the session */
+function markMonarchSessionSuspect(): void {
+  lastValidatedAt = 0;
+}
+
+function isAuthError(error: unknown): boolean {
+  if (!(error instanceof Error)) return false;
+  if (AUTH_ERROR_NAMES.has(error.name)) return true;
+
+  // Raw HTTP/GraphQL failures carry the status on the error or its response
+  const { status, statusCode, response } = error as {
+    status?: unknown;
+    statusCode?: unknown;
+    response?: { status?: unknown };
+  };
+  return [status, statusCode, response?.status].some((code) => code === 401 || code === 403);
+}
+
 async function createClient(): Promise<MonarchClient> {
   const email = process.env.MONARCH_EMAIL;
   const password = process.env.MONARCH_PASSWORD;
@@ -79,4 +132,5 @@ async function createClient(): Promise<MonarchClient> {
 export function resetMonarchClient(): void {
   clientInstance = null;
   loginPromise = null;
+  lastValidatedAt = 0;
 }
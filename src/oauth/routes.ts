@@ -1,5 +1,5 @@
-import { Hono } from "hono";
-import { timingSafeEqual } from "crypto";
+import { Hono, type Context } from "hono";
+import { createHash, timingSafeEqual } from "crypto";
 import {
   generateAuthCode,
   consumeAuthCode,
@@ -24,30 +24,47 @@ function safeCompare(a: string, b: string): boolean {
 
 export const oauthRouter = new Hono();
 
+/** Public base URL, if pinned via env. Read once — it is fixed for the process. */
+const BASE_URL = (process.env.BASE_URL || "").replace(/\/+$/, "");
+
+/** Resolve the issuer URL, deriving it from the request when BASE_URL is unset */
+function resolveIssuer(c: Context): string {
+  if (BASE_URL) return BASE_URL;
+  const url = new URL(c.req.url);
+  const proto = c.req.header("x-forwarded-proto") || url.protocol.replace(":", "");
+  return `${proto}://${url.host}`;
+}
+
+/** Client IDs are UUIDs; anything much longer is rejected without a DB lookup */
+const MAX_CLIENT_ID_LENGTH = 64;
+
+function isKnownClient(clientId: string): boolean {
+  return clientId.length <= MAX_CLIENT_ID_LENGTH && validateClient(clientId);
+}
+
 // ── Helper: PKCE S256 verification ──────────────────────────────────────────
 
-async function verifyCodeChallenge(
+function verifyCodeChallenge(
   codeVerifier: string,
   codeChallenge: string
-): Promise<boolean> {
-  const encoder = new TextEncoder();
-  const data = encoder.encode(codeVerifier);
-  const digest = await crypto.subtle.digest("SHA-256", data);
-  const base64url = btoa(String.fromCharCode(...new Uint8Array(digest)))
-    .replace(/\+/g, "-")
-    .replace(/\//g, "_")
-    .replace(/=+$/, "");
-  return base64url === codeChallenge;
+): boolean {
+  // base64url digest encoding is native — no btoa round trip or padding fixups
+  const digest = createHash("sha256").update(codeVerifier).digest("base64url");
+  return safeCompare(digest, codeChallenge);
 }
 
 // ── RFC 8414: OAuth Authorization Server Metadata ───────────────────────────
 
-oauthRouter.get("/.well-known/oauth-authorization-server", (c) => {
-  const url = new URL(c.req.url);
-  const proto = c.req.header("x-forwarded-proto") || url.protocol.replace(":", "");
-  const issuer = `${proto}://${url.host}`;
+/**
+ * Metadata for the last issuer served. The issuer only varies when BASE_URL is
+ * unset, and then a deployment answers on one host, so one entry is enough.
+ */
+let cachedMetadata: { issuer: string; body: Record<string, unknown> } | null = null;
+
+function authServerMetadata(issuer: string): Record<string, unknown> {
+  if (cachedMetadata?.issuer === issuer) return cachedMetadata.body;
 
-  return c.json({
+  const body = {
     issuer,
     authorization_endpoint: `${issuer}/oauth/authorize`,
     token_endpoint: `${issuer}/oauth/token`,
@@ -57,7 +74,17 @@ oauthRouter.get("/.well-known/oauth-authorization-server", (c) => {
     token_endpoint_auth_methods_supported: ["none"],
     code_challenge_methods_supported: ["S256"],
     scopes_supported: ["monarch:read", "monarch:write"],
-  });
+  };
+  cachedMetadata = { issuer, body };
+  return body;
+}
+
+oauthRouter.get("/.well-known/oauth-authorization-server", (c) => {
+  // The document only changes on redeploy — let clients reuse it for an hour
+  c.header("Cache-Control", "max-age=3600");
+  // Without BASE_URL the issuer is built from these headers, so a shared cache must key on them
+  if (!BASE_URL) c.header("Vary", "Host, X-Forwarded-Proto");
+  return c.json(authServerMetadata(resolveIssuer(c)));
 });
 
 // ── RFC 7591: Dynamic Client Registration ───────────────────────────────────
@@ -105,13 +132,16 @@ oauthRouter.post("/oauth/register", async (c) => {
     }
   }
 
-  const { clientId } = registerClient(clientName, redirectUris);
+  // Store each URI once; the authorize check matches against this list
+  const uniqueUris = [...new Set(redirectUris)];
+  const { clientId, issuedAt } = registerClient(clientName, uniqueUris);
 
   return c.json(
     {
       client_id: clientId,
+      client_id_issued_at: issuedAt,
       client_name: clientName,
-      redirect_uris: redirectUris,
+      redirect_uris: uniqueUris,
       token_endpoint_auth_method: "none",
       grant_types: ["authorization_code", "refresh_token"],
       response_types: ["code"],
@@ -123,12 +153,14 @@ oauthRouter.post("/oauth/register", async (c) => {
 // ── GET /oauth/authorize — Show authorization form ──────────────────────────
 
 oauthRouter.get("/oauth/authorize", (c) => {
-  const clientId = c.req.query("client_id");
-  const redirectUri = c.req.query("redirect_uri");
-  const state = c.req.query("state") || "";
-  const codeChallenge = c.req.query("code_challenge") || "";
-  const codeChallengeMethod = c.req.query("code_challenge_method") || "";
-  const responseType = c.req.query("response_type");
+  // Parse the query string once rather than once per parameter
+  const query = c.req.query();
+  const clientId = query.client_id;
+  const redirectUri = query.redirect_uri;
+  const state = query.state || "";
+  const codeChallenge = query.code_challenge || "";
+  const codeChallengeMethod = query.code_challenge_method || "";
+  const responseType = query.response_type;
 
   if (responseType !== "code") {
     return c.json(
@@ -150,7 +182,7 @@ oauthRouter.get("/oauth/authorize", (c) => {
     );
   }
 
-  if (!validateClient(clientId)) {
+  if (!isKnownClient(clientId)) {
     return c.json(
       {
         error: "invalid_client",
@@ -206,20 +238,6 @@ oauthRouter.post("/oauth/authorize", async (c) => {
     code_challenge_method: codeChallengeMethod,
   } = body;
 
-  if (!passphrase) {
-    return c.html(
-      renderAuthForm({
-        clientId: clientId || "",
-        redirectUri: redirectUri || "",
-        state: state || "",
-        codeChallenge: codeChallenge || "",
-        codeChallengeMethod: codeChallengeMethod || "",
-        errorMessage: "Passphrase is required.",
-      }),
-      400
-    );
-  }
-
   if (!clientId || !redirectUri) {
     return c.json(
       {
@@ -230,7 +248,7 @@ oauthRouter.post("/oauth/authorize", async (c) => {
     );
   }
 
-  if (!validateClient(clientId)) {
+  if (!isKnownClient(clientId)) {
     return c.json(
       { error: "invalid_client", error_description: "Unknown client_id." },
       400
@@ -249,6 +267,20 @@ oauthRouter.post("/oauth/authorize", async (c) => {
     );
   }
 
+  if (!passphrase) {
+    return c.html(
+      renderAuthForm({
+        clientId,
+        redirectUri,
+        state: state || "",
+        codeChallenge: codeChallenge || "",
+        codeChallengeMethod: codeChallengeMethod || "",
+        errorMessage: "Passphrase is required.",
+      }),
+      400
+    );
+  }
+
   // Validate passphrase against server secret
   const expectedPassphrase = process.env.OAUTH_PASSPHRASE;
   if (!expectedPassphrase) {
@@ -379,7 +411,7 @@ oauthRouter.post("/oauth/token", async (c) => {
         );
       }
 
-      const valid = await verifyCodeChallenge(
+      const valid = verifyCodeChallenge(
         codeVerifier,
         authCode.code_challenge
       );
@@ -574,11 +606,11 @@ function renderAuthForm(params: {
     </div>
     ${errorHtml}
     <form method="POST" action="/oauth/authorize">
-      <input type="hidden" name="client_id" value="${escapeAttr(params.clientId)}" />
-      <input type="hidden" name="redirect_uri" value="${escapeAttr(params.redirectUri)}" />
-      <input type="hidden" name="state" value="${escapeAttr(params.state)}" />
-      <input type="hidden" name="code_challenge" value="${escapeAttr(params.codeChallenge)}" />
-      <input type="hidden" name="code_challenge_method" value="${escapeAttr(params.codeChallengeMethod)}" />
+      <input type="hidden" name="client_id" value="${escapeHtml(params.clientId)}" />
+      <input type="hidden" name="redirect_uri" value="${escapeHtml(params.redirectUri)}" />
+      <input type="hidden" name="state" value="${escapeHtml(params.state)}" />
+      <input type="hidden" name="code_challenge" value="${escapeHtml(params.codeChallenge)}" />
+      <input type="hidden" name="code_challenge_method" value="${escapeHtml(params.codeChallengeMethod)}" />
 
       <label for="passphrase">Passphrase</label>
       <input type="password" id="passphrase" name="passphrase" required autocomplete="off" placeholder="Enter server passphrase" />
@@ -593,19 +625,15 @@ function renderAuthForm(params: {
 </html>`;
 }
 
-function escapeHtml(str: string): string {
-  return str
-    .replace(/&/g, "&amp;")
-    .replace(/</g, "&lt;")
-    .replace(/>/g, "&gt;")
-    .replace(/"/g, "&quot;")
-    .replace(/'/g, "&#39;");
-}
+const HTML_ESCAPES: Record<string, string> = {
+  "&": "&amp;",
+  "<": "&lt;",
+  ">": "&gt;",
+  '"': "&quot;",
+  "'": "&#39;",
+};
 
-function escapeAttr(str: string): string {
-  return str
-    .replace(/&/g, "&amp;")
-    .replace(/"/g, "&quot;")
-    .replace(/</g, "&lt;")
-    .replace(/>/g, "&gt;");
+/** Escape text for element content and quoted attributes in one pass */
+function escapeHtml(str: string): string {
+  return str.replace(/[&<>"']/g, (ch) => HTML_ESCAPES[ch]!);
 }
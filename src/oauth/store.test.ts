@@ -1,7 +1,10 @@
 import { describe, expect, test, beforeEach, afterEach } from "bun:test";
+import { Database } from "bun:sqlite";
+import { createHash } from "node:crypto";
 import { unlinkSync, existsSync } from "node:fs";
 import {
   initTokenStore,
+  closeTokenStore,
   generateAuthCode,
   consumeAuthCode,
   generateTokenPair,
@@ -11,6 +14,7 @@ import {
   validateClient,
   getClientRedirectUris,
   cleanupExpired,
+  sweepExpired,
 } from "./store.js";
 
 const TEST_DB = "/tmp/monarch-mcp-test.db";
@@ -25,12 +29,54 @@ beforeEach(() => {
 });
 
 afterEach(() => {
+  closeTokenStore();
   for (const suffix of ["", "-shm", "-wal"]) {
     const path = TEST_DB + suffix;
     if (existsSync(path)) unlinkSync(path);
   }
 });
 
+/** Open a second connection to the test file, bypassing the store, and close it afterwards */
+function withRawDb<T>(fn: (raw: Database) => T): T {
+  const raw = new Database(TEST_DB);
+  try {
+    return fn(raw);
+  } finally {
+    raw.close();
+  }
+}
+
+/** Write already-expired codes and tokens straight to the file */
+function insertExpiredRows(count: number): void {
+  const past = Math.floor(Date.now() / 1000) - 60;
+  withRawDb((raw) =>
+    raw.transaction(() => {
+      const code = raw.query(
+        "INSERT INTO auth_codes (code, client_id, redirect_uri, created_at, expires_at) VALUES (?, 'client', 'http://localhost/cb', ?, ?)"
+      );
+      const token = raw.query(
+        "INSERT INTO tokens (token, type, client_id, created_at, expires_at) VALUES (?, 'access', 'client', ?, ?)"
+      );
+      for (let i = 0; i < count; i++) {
+        code.run(`expired-code-${i}`, past - 600, past);
+        token.run(`expired-token-${i}`, past - 3600, past);
+      }
+    })()
+  );
+}
+
+function countRows(table: "auth_codes" | "tokens"): number {
+  return withRawDb(
+    (raw) => (raw.query(`SELECT COUNT(*) AS n FROM ${table}`).get() as { n: number }).n
+  );
+}
+
+function freelistCount(): number {
+  return withRawDb(
+    (raw) => (raw.query("PRAGMA freelist_count").get() as { freelist_count: number }).freelist_count
+  );
+}
+
 describe("Client Registration", () => {
   test("registers a client and validates it", () => {
     const { clientId } = registerClient("Test App", ["http://localhost:3000/callback"]);
@@ -39,6 +85,13 @@ describe("Client Registration", () => {
     expect(validateClient(clientId)).toBe(true);
   });
 
+  test("returns the issue time as unix seconds", () => {
+    const before = Math.floor(Date.now() / 1000);
+    const { issuedAt } = registerClient("Test App", ["http://localhost:3000/callback"]);
+    expect(Number.isInteger(issuedAt)).toBe(true);
+    expect(issuedAt).toBeGreaterThanOrEqual(before);
+  });
+
   test("returns false for unknown client", () => {
     expect(validateClient("nonexistent-id")).toBe(false);
   });
@@ -84,6 +137,34 @@ describe("Auth Codes", () => {
   test("returns null for non-existent code", () => {
     expect(consumeAuthCode("nonexistent")).toBeNull();
   });
+
+  test("rejects an expired code", () => {
+    const { clientId } = registerClient("Test", ["http://localhost/cb"]);
+    const code = "expired-code";
+    const past = Math.floor(Date.now() / 1000) - 60;
+
+    withRawDb((raw) =>
+      raw
+        .query(
+          "INSERT INTO auth_codes (code, client_id, redirect_uri, created_at, expires_at) VALUES (?, ?, 'http://localhost/cb', ?, ?)"
+        )
+        .run(createHash("sha256").update(code).digest("hex"), clientId, past - 600, past)
+    );
+
+    expect(consumeAuthCode(code)).toBeNull();
+  });
+
+  test("stores only a digest of the code", () => {
+    const { clientId } = registerClient("Test", ["http://localhost/cb"]);
+    const code = generateAuthCode(clientId, "http://localhost/cb");
+
+    const stored = withRawDb(
+      (raw) => raw.query("SELECT code FROM auth_codes").get() as { code: string }
+    );
+
+    expect(stored.code).not.toBe(code);
+    expect(stored.code).toMatch(/^[0-9a-f]{64}$/);
+  });
 });
 
 describe("Tokens", () => {
@@ -130,6 +211,65 @@ describe("Tokens", () => {
   test("returns null for invalid refresh token", () => {
     expect(refreshAccessToken("invalid")).toBeNull();
   });
+
+  test("stores only digests of issued tokens", () => {
+    const { clientId } = registerClient("Test", ["http://localhost/cb"]);
+    const { accessToken, refreshToken } = generateTokenPair(clientId);
+
+    const stored = withRawDb(
+      (raw) => raw.query("SELECT token FROM tokens").all() as { token: string }[]
+    );
+
+    expect(stored).toHaveLength(2);
+    for (const { token } of stored) {
+      expect(token).not.toBe(accessToken);
+      expect(token).not.toBe(refreshToken);
+      expect(token).toMatch(/^[0-9a-f]{64}$/);
+    }
+  });
+});
+
+describe("Initialization", () => {
+  test("keeps tokens written before digests were stored", () => {
+    const { clientId } = registerClient("Test", ["http://localhost/cb"]);
+    const legacyToken = crypto.randomUUID();
+    const now = Math.floor(Date.now() / 1000);
+    closeTokenStore();
+
+    // A pre-upgrade file: raw token in the row, no schema version yet
+    withRawDb((raw) => {
+      raw
+        .query(
+          "INSERT INTO tokens (token, type, client_id, created_at, expires_at) VALUES (?, 'access', ?, ?, ?)"
+        )
+        .run(legacyToken, clientId, now, now + 3600);
+      raw.run("PRAGMA user_version = 0");
+    });
+
+    initTokenStore(TEST_DB);
+    expect(validateAccessToken(legacyToken)).toBe(true);
+  });
+
+  test("re-initializing the same path keeps existing data", () => {
+    const { clientId } = registerClient("Test", ["http://localhost/cb"]);
+    initTokenStore(TEST_DB);
+    expect(validateClient(clientId)).toBe(true);
+  });
+
+  test("supports an in-memory database", () => {
+    initTokenStore(":memory:");
+    const { clientId } = registerClient("Test", ["http://localhost/cb"]);
+    const { accessToken } = generateTokenPair(clientId);
+    expect(validateAccessToken(accessToken)).toBe(true);
+  });
+
+  test("creates new databases with incremental auto-vacuum", () => {
+    const { auto_vacuum } = withRawDb(
+      (raw) => raw.query("PRAGMA auto_vacuum").get() as { auto_vacuum: number }
+    );
+
+    expect(auto_vacuum).toBe(2); // INCREMENTAL
+  });
 });
 
 describe("Cleanup", () => {
@@ -141,4 +281,86 @@ describe("Cleanup", () => {
     // Should not throw
     expect(() => cleanupExpired()).not.toThrow();
   });
+
+  test("cleanupExpired keeps unexpired codes and tokens", () => {
+    const { clientId } = registerClient("Test", ["http://localhost/cb"]);
+    const code = generateAuthCode(clientId, "http://localhost/cb");
+    const { accessToken } = generateTokenPair(clientId);
+
+    cleanupExpired();
+
+    expect(validateAccessToken(accessToken)).toBe(true);
+    expect(consumeAuthCode(code)).not.toBeNull();
+  });
+
+  test("cleanupExpired deletes an expired backlog larger than one batch", () => {
+    insertExpiredRows(2500);
+
+    cleanupExpired();
+
+    expect(countRows("auth_codes")).toBe(0);
+    expect(countRows("tokens")).toBe(0);
+  });
+
+  test("cleanupExpired returns free pages to the OS", () => {
+    insertExpiredRows(5000);
+
+    withRawDb((raw) => {
+      raw.run("DELETE FROM auth_codes");
+      raw.run("DELETE FROM tokens");
+    });
+    const before = freelistCount();
+
+    cleanupExpired();
+
+    const after = freelistCount();
+
+    // Every page up to the per-sweep limit is released, not just the first one
+    expect(before).toBeGreaterThan(1);
+    expect(after).toBe(Math.max(0, before - 100));
+  });
+
+  test("sweepExpired keeps unexpired codes and tokens", async () => {
+    const { clientId } = registerClient("Test", ["http://localhost/cb"]);
+    const code = generateAuthCode(clientId, "http://localhost/cb");
+    const { accessToken } = generateTokenPair(clientId);
+
+    await sweepExpired();
+
+    expect(validateAccessToken(accessToken)).toBe(true);
+    expect(consumeAuthCode(code)).not.toBeNull();
+  });
+
+  test("sweepExpired deletes an expired backlog across several batches", async () => {
+    insertExpiredRows(2500);
+
+    await sweepExpired();
+
+    expect(countRows("auth_codes")).toBe(0);
+    expect(countRows("tokens")).toBe(0);
+  });
+
+  test("sweepExpired stops when the store is closed mid-sweep", async () => {
+    insertExpiredRows(2500);
+
+    // The first batch runs synchronously; the sweep then yields
+    const sweep = sweepExpired();
+    closeTokenStore();
+    await sweep;
+
+    expect(countRows("auth_codes")).toBe(1500);
+    expect(countRows("tokens")).toBe(2500);
+  });
+
+  test("sweepExpired stops when the store is reopened mid-sweep", async () => {
+    insertExpiredRows(2500);
+
+    const sweep = sweepExpired();
+    closeTokenStore();
+    initTokenStore(TEST_DB);
+    await sweep;
+
+    expect(countRows("auth_codes")).toBe(1500);
+    expect(countRows("tokens")).toBe(2500);
+  });
 });
@@ -3,14 +3,12 @@ import crypto from "node:crypto";
 
 // ── Types ───────────────────────────────────────────────────────────────────
 
+/** The columns the token endpoint needs from a consumed auth code */
 interface AuthCode {
-  code: string;
   client_id: string;
   redirect_uri: string;
   code_challenge: string | null;
   code_challenge_method: string | null;
-  created_at: number;
-  expires_at: number;
 }
 
 interface TokenPair {
@@ -31,48 +29,171 @@ interface ClientRecord {
 const ACCESS_TOKEN_TTL = 60 * 60;           // 1 hour in seconds
 const REFRESH_TOKEN_TTL = 30 * 24 * 60 * 60; // 30 days in seconds
 const AUTH_CODE_TTL = 10 * 60;               // 10 minutes in seconds
+const CLEANUP_BATCH_SIZE = 1000;              // rows deleted per cleanup statement
+const CLIENT_CACHE_MAX = 1000;                // clients kept in each in-memory client cache
+const VACUUM_PAGES = 100;                     // free pages released per cleanup
+const SCHEMA_VERSION = 1;                     // PRAGMA user_version once migrations have run
+
+// ── SQL ─────────────────────────────────────────────────────────────────────
+
+// db.query() caches compiled statements by SQL text, so each hot statement is
+// spelled exactly once and always hits the same cache entry.
+
+const SQL_INSERT_AUTH_CODE = `INSERT INTO auth_codes (code, client_id, redirect_uri, code_challenge, code_challenge_method, created_at, expires_at)
+  VALUES (?, ?, ?, ?, ?, ?, ?)`;
+const SQL_CONSUME_AUTH_CODE = `DELETE FROM auth_codes WHERE code = ? AND expires_at >= ?
+  RETURNING client_id, redirect_uri, code_challenge, code_challenge_method`;
+const SQL_INSERT_TOKEN =
+  "INSERT INTO tokens (token, type, client_id, created_at, expires_at) VALUES (?, ?, ?, ?, ?)";
+const SQL_VALIDATE_ACCESS_TOKEN =
+  "SELECT 1 FROM tokens WHERE token = ? AND type = 'access' AND expires_at > ?";
+const SQL_CONSUME_REFRESH_TOKEN = `DELETE FROM tokens WHERE token = ? AND type = 'refresh' AND expires_at > ?
+  RETURNING client_id`;
+const SQL_REVOKE_ACCESS_TOKENS = "DELETE FROM tokens WHERE client_id = ? AND type = 'access'";
+const SQL_INSERT_CLIENT =
+  "INSERT INTO clients (client_id, client_name, redirect_uris, created_at) VALUES (?, ?, ?, ?)";
+const SQL_CLIENT_EXISTS = "SELECT 1 FROM clients WHERE client_id = ?";
+const SQL_CLIENT_REDIRECT_URIS = "SELECT redirect_uris FROM clients WHERE client_id = ?";
+const SQL_PURGE_AUTH_CODES =
+  "DELETE FROM auth_codes WHERE code IN (SELECT code FROM auth_codes WHERE expires_at < ? LIMIT ?)";
+const SQL_PURGE_TOKENS =
+  "DELETE FROM tokens WHERE token IN (SELECT token FROM tokens WHERE expires_at < ? LIMIT ?)";
+const SQL_INCREMENTAL_VACUUM = `PRAGMA incremental_vacuum(${VACUUM_PAGES})`;
+
+// ── In-memory caches ────────────────────────────────────────────────────────
+
+/**
+ * Look up a cache entry and mark it most recently used. Maps iterate in
+ * insertion order, so re-inserting on every hit keeps the coldest key first.
+ */
+function recallBounded<K, V>(map: Map<K, V>, key: K): V | undefined {
+  const value = map.get(key);
+  if (value !== undefined) {
+    map.delete(key);
+    map.set(key, value);
+  }
+  return value;
+}
+
+/** Store a cache entry, evicting the least recently used one once `max` is reached */
+function rememberBounded<K, V>(map: Map<K, V>, key: K, value: V, max: number): void {
+  map.delete(key);
+  if (map.size >= max) {
+    const coldest = map.keys().next().value;
+    if (coldest !== undefined) map.delete(coldest);
+  }
+  map.set(key, value);
+}
+
+/**
+ * SHA-256 hex digest of a bearer token or auth code. The tokens and auth_codes
+ * tables are keyed by this, so raw secrets are never stored. Both are high-entropy random values, so an unsalted fast hash
+ * is enough to make a leaked row useless.
+ */
+function hashToken(token: string): string {
+  return crypto.createHash("sha256").update(token).digest("hex");
+}
+
+/** Client IDs confirmed to exist. Clients are never deleted, so a hit cannot go stale. */
+const knownClients = new Map<string, true>();
+
+/** Parsed redirect URIs per client. They are fixed at registration, so entries never go stale. */
+const clientRedirectUris = new Map<string, string[]>();
 
 // ── Database singleton ──────────────────────────────────────────────────────
 
 let db: Database | null = null;
+let openPath: string | null = null;
 
 export function initTokenStore(dbPath = "monarch-mcp.db") {
+  // Schema setup runs once per database — repeat calls for the same path are no-ops
+  if (db && openPath === dbPath) return;
+  closeTokenStore();
+
   db = new Database(dbPath);
-  db.run("PRAGMA journal_mode=WAL");
-  db.run("PRAGMA busy_timeout=5000");
+  openPath = dbPath;
+  // Lets cleanupExpired() hand freed pages back to the OS. Only takes effect on
+  // a brand-new file, and switching to WAL already writes the header, so it
+  // must come first; older database files keep their mode
+  db.run("PRAGMA auto_vacuum=INCREMENTAL");
+  // An in-memory store has no journal file or fsync to tune
+  if (dbPath !== ":memory:") {
+    db.run("PRAGMA journal_mode=WAL");
+    db.run("PRAGMA busy_timeout=5000");
+    // WAL makes NORMAL durable across app crashes; only an OS crash can drop the last commits
+    db.run("PRAGMA synchronous=NORMAL");
+  }
+  db.run("PRAGMA temp_store=MEMORY");
+  db.run("PRAGMA cache_size=-8000"); // ~8 MB page cache
+
+  // One write transaction for the whole schema: a single commit, and another
+  // process opening the same file waits on busy_timeout instead of interleaving
+  const store = db;
+  store.transaction(() => {
+    createSchema(store);
+    migrate(store);
+  }).immediate();
+}
 
-  db.run(`
+function createSchema(store: Database): void {
+  // run() steps through every statement in the string, so the whole schema
+  // is sent as one script. Every table is looked up by its random key, so rows
+  // live in the primary-key B-tree; cleanupExpired() range-scans on expires_at.
+  store.run(`
     CREATE TABLE IF NOT EXISTS auth_codes (
-      code TEXT PRIMARY KEY,
+      code TEXT PRIMARY KEY, -- hashToken() digest, never the raw code
       client_id TEXT NOT NULL,
       redirect_uri TEXT NOT NULL,
       code_challenge TEXT,
       code_challenge_method TEXT,
       created_at INTEGER NOT NULL,
       expires_at INTEGER NOT NULL
-    )
-  `);
+    ) WITHOUT ROWID;
 
-  db.run(`
     CREATE TABLE IF NOT EXISTS tokens (
-      token TEXT PRIMARY KEY,
+      token TEXT PRIMARY KEY, -- hashToken() digest, never the raw token
       type TEXT NOT NULL CHECK(type IN ('access', 'refresh')),
       client_id TEXT NOT NULL,
       created_at INTEGER NOT NULL,
       expires_at INTEGER NOT NULL
-    )
-  `);
+    ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS idx_auth_codes_expires ON auth_codes(expires_at);
+    CREATE INDEX IF NOT EXISTS idx_tokens_expires ON tokens(expires_at);
 
-  db.run(`
     CREATE TABLE IF NOT EXISTS clients (
       client_id TEXT PRIMARY KEY,
       client_name TEXT,
       redirect_uris TEXT NOT NULL,
       created_at INTEGER NOT NULL
-    )
+    ) WITHOUT ROWID;
   `);
 }
 
+/** One-time upgrades for database files written by older versions */
+function migrate(store: Database): void {
+  const { user_version } = store.query("PRAGMA user_version").get() as { user_version: number };
+  if (user_version >= SCHEMA_VERSION) return;
+
+  // Tokens used to be stored raw. They are UUIDs (36 chars) while digests are
+  // 64 hex chars, so rekey the old rows and connected clients stay signed in
+  const legacy = store
+    .query("SELECT token FROM tokens WHERE length(token) = 36")
+    .all() as { token: string }[];
+  const rekey = store.query("UPDATE tokens SET token = ? WHERE token = ?");
+  for (const { token } of legacy) rekey.run(hashToken(token), token);
+
+  store.run(`PRAGMA user_version = ${SCHEMA_VERSION}`);
+}
+
+export function closeTokenStore(): void {
+  db?.close();
+  db = null;
+  openPath = null;
+  knownClients.clear();
+  clientRedirectUris.clear();
+}
+
 function getDb(): Database {
   if (!db) {
     throw new Error("Token store not initialized. Call initTokenStore() first.");
@@ -93,12 +214,9 @@ export function generateAuthCode(
   const now = Math.floor(Date.now() / 1000);
 
   store
-    .prepare(
-      `INSERT INTO auth_codes (code, client_id, redirect_uri, code_challenge, code_challenge_method, created_at, expires_at)
-       VALUES (?, ?, ?, ?, ?, ?, ?)`
-    )
+    .query(SQL_INSERT_AUTH_CODE)
     .run(
-      code,
+      hashToken(code),
       clientId,
       redirectUri,
       codeChallenge ?? null,
@@ -114,22 +232,13 @@ export function consumeAuthCode(code: string): AuthCode | null {
   const store = getDb();
   const now = Math.floor(Date.now() / 1000);
 
+  // Read and delete in one statement so the code is single-use. An expired
+  // code matches nothing and is left for cleanupExpired() to sweep.
   const row = store
-    .prepare(
-      `SELECT code, client_id, redirect_uri, code_challenge, code_challenge_method, created_at, expires_at
-       FROM auth_codes WHERE code = ?`
-    )
-    .get(code) as AuthCode | undefined;
-
-  if (!row) return null;
-
-  // Always delete the code (single-use)
-  store.prepare("DELETE FROM auth_codes WHERE code = ?").run(code);
+    .query(SQL_CONSUME_AUTH_CODE)
+    .get(hashToken(code), now) as AuthCode | undefined;
 
-  // Check expiry after deletion so the code cannot be replayed
-  if (row.expires_at < now) return null;
-
-  return row;
+  return row ?? null;
 }
 
 // ── Tokens ──────────────────────────────────────────────────────────────────
@@ -141,17 +250,12 @@ export function generateTokenPair(clientId: string): TokenPair {
   const accessToken = crypto.randomUUID();
   const refreshToken = crypto.randomUUID();
 
-  store
-    .prepare(
-      `INSERT INTO tokens (token, type, client_id, created_at, expires_at) VALUES (?, 'access', ?, ?, ?)`
-    )
-    .run(accessToken, clientId, now, now + ACCESS_TOKEN_TTL);
-
-  store
-    .prepare(
-      `INSERT INTO tokens (token, type, client_id, created_at, expires_at) VALUES (?, 'refresh', ?, ?, ?)`
-    )
-    .run(refreshToken, clientId, now, now + REFRESH_TOKEN_TTL);
+  // Both rows commit together — one WAL commit instead of two
+  store.transaction(() => {
+    const insert = store.query(SQL_INSERT_TOKEN);
+    insert.run(hashToken(accessToken), "access", clientId, now, now + ACCESS_TOKEN_TTL);
+    insert.run(hashToken(refreshToken), "refresh", clientId, now, now + REFRESH_TOKEN_TTL);
+  })();
 
   return {
     accessToken,
@@ -165,10 +269,8 @@ export function validateAccessToken(token: string): boolean {
   const now = Math.floor(Date.now() / 1000);
 
   const row = store
-    .prepare(
-      `SELECT token FROM tokens WHERE token = ? AND type = 'access' AND expires_at > ?`
-    )
-    .get(token, now) as { token: string } | undefined;
+    .query(SQL_VALIDATE_ACCESS_TOKEN)
+    .get(hashToken(token), now);
 
   return !!row;
 }
@@ -179,27 +281,20 @@ export function refreshAccessToken(
   const store = getDb();
   const now = Math.floor(Date.now() / 1000);
 
-  const row = store
-    .prepare(
-      `SELECT token, client_id FROM tokens WHERE token = ? AND type = 'refresh' AND expires_at > ?`
-    )
-    .get(refreshToken, now) as
-    | { token: string; client_id: string }
-    | undefined;
-
-  if (!row) return null;
+  // Consume, revoke, and re-issue as a single transaction
+  return store.transaction(() => {
+    // Rotate: validate and delete the old refresh token in one statement to prevent reuse
+    const row = store
+      .query(SQL_CONSUME_REFRESH_TOKEN)
+      .get(hashToken(refreshToken), now) as { client_id: string } | undefined;
 
-  // Rotate: delete the old refresh token to prevent reuse
-  store.prepare("DELETE FROM tokens WHERE token = ?").run(refreshToken);
+    if (!row) return null;
 
-  // Also delete any existing access tokens for this client to keep things tidy
-  store
-    .prepare(
-      "DELETE FROM tokens WHERE client_id = ? AND type = 'access'"
-    )
-    .run(row.client_id);
+    // Also delete any existing access tokens for this client to keep things tidy
+    store.query(SQL_REVOKE_ACCESS_TOKENS).run(row.client_id);
 
-  return generateTokenPair(row.client_id);
+    return generateTokenPair(row.client_id);
+  })();
 }
 
 // ── Clients ─────────────────────────────────────────────────────────────────
@@ -207,44 +302,57 @@ export function refreshAccessToken(
 export function registerClient(
   clientName: string,
   redirectUris: string[]
-): { clientId: string } {
+): { clientId: string; issuedAt: number } {
   const store = getDb();
   const clientId = crypto.randomUUID();
   const now = Math.floor(Date.now() / 1000);
 
   store
-    .prepare(
-      `INSERT INTO clients (client_id, client_name, redirect_uris, created_at) VALUES (?, ?, ?, ?)`
-    )
+    .query(SQL_INSERT_CLIENT)
     .run(clientId, clientName, JSON.stringify(redirectUris), now);
 
-  return { clientId };
+  return { clientId, issuedAt: now };
 }
 
 export function validateClient(clientId: string): boolean {
+  if (recallBounded(knownClients, clientId)) return true;
+
   const store = getDb();
 
+  // Existence check only — the primary-key probe answers it without decoding the row
   const row = store
-    .prepare("SELECT client_id FROM clients WHERE client_id = ?")
-    .get(clientId) as { client_id: string } | undefined;
+    .query(SQL_CLIENT_EXISTS)
+    .get(clientId);
 
-  return !!row;
+  if (!row) return false;
+
+  rememberBounded(knownClients, clientId, true, CLIENT_CACHE_MAX);
+
+  return true;
 }
 
 export function getClientRedirectUris(clientId: string): string[] {
+  const cached = recallBounded(clientRedirectUris, clientId);
+  if (cached) return cached;
+
   const store = getDb();
 
   const row = store
-    .prepare("SELECT redirect_uris FROM clients WHERE client_id = ?")
+    .query(SQL_CLIENT_REDIRECT_URIS)
     .get(clientId) as { redirect_uris: string } | undefined;
 
   if (!row) return [];
 
+  let uris: string[];
   try {
-    return JSON.parse(row.redirect_uris) as string[];
+    uris = JSON.parse(row.redirect_uris) as string[];
   } catch {
     return [];
   }
+
+  rememberBounded(clientRedirectUris, clientId, uris, CLIENT_CACHE_MAX);
+
+  return uris;
 }
 
 // ── Maintenance ─────────────────────────────────────────────────────────────
@@ -253,6 +361,40 @@ export function cleanupExpired(): void {
   const store = getDb();
   const now = Math.floor(Date.now() / 1000);
 
-  store.prepare("DELETE FROM auth_codes WHERE expires_at < ?").run(now);
-  store.prepare("DELETE FROM tokens WHERE expires_at < ?").run(now);
+  deleteInBatches(store, SQL_PURGE_AUTH_CODES, now);
+  deleteInBatches(store, SQL_PURGE_TOKENS, now);
+  finishCleanup(store);
+}
+
+/**
+ * cleanupExpired() for the periodic timer. bun:sqlite is synchronous, so this
+ * yields to the event loop between batches; a large expiry backlog is cleared
+ * in short slices instead of stalling in-flight requests.
+ */
+export async function sweepExpired(): Promise<void> {
+  const store = getDb();
+  const now = Math.floor(Date.now() / 1000);
+
+  for (const sql of [SQL_PURGE_AUTH_CODES, SQL_PURGE_TOKENS]) {
+    while (store.query(sql).run(now, CLEANUP_BATCH_SIZE).changes >= CLEANUP_BATCH_SIZE) {
+      await new Promise((resolve) => setImmediate(resolve));
+      // The store may have been closed or reopened while we yielded
+      if (db !== store) return;
+    }
+  }
+  finishCleanup(store);
+}
+
+/** Run a bounded DELETE until it stops filling a batch, so no single statement holds the write lock for long */
+function deleteInBatches(store: Database, sql: string, now: number): void {
+  let changes: number;
+  do {
+    changes = store.query(sql).run(now, CLEANUP_BATCH_SIZE).changes;
+  } while (changes >= CLEANUP_BATCH_SIZE);
+}
+
+function finishCleanup(store: Database): void {
+  // Bounded so a large backlog of free pages is returned over several sweeps.
+  // Each step of the pragma frees one page; run() steps it to completion
+  store.query(SQL_INCREMENTAL_VACUUM).run();
 }
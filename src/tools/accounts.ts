@@ -1,6 +1,36 @@
 import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import { z } from "zod";
-import { getMonarchClient } from "../monarch/client.js";
+import { withMonarchClient } from "../monarch/client.js";
+import { jsonResult, errorResult } from "./response.js";
+
+const getAccountsInput = {
+  includeHidden: z
+    .boolean()
+    .optional()
+    .describe(
+      "Whether to include hidden/archived accounts in the results. Defaults to false."
+    ),
+};
+
+const getAccountHistoryInput = {
+  accountId: z
+    .string()
+    .describe(
+      "The unique identifier of the account to get history for. Obtain this from get_accounts."
+    ),
+  startDate: z
+    .string()
+    .optional()
+    .describe(
+      "Start date for the history range in YYYY-MM-DD format. Defaults to the earliest available data."
+    ),
+  endDate: z
+    .string()
+    .optional()
+    .describe(
+      "End date for the history range in YYYY-MM-DD format. Defaults to today."
+    ),
+};
 
 export function registerAccountTools(server: McpServer) {
   server.registerTool(
@@ -8,34 +38,19 @@ export function registerAccountTools(server: McpServer) {
     {
       description:
         "List all financial accounts linked to Monarch Money, including bank accounts, credit cards, investments, loans, and other assets. Returns account names, types, current balances, and institution details. Use this to get an overview of all connected accounts or find a specific account ID for further queries.",
-      inputSchema: {
-        includeHidden: z
-          .boolean()
-          .optional()
-          .describe(
-            "Whether to include hidden/archived accounts in the results. Defaults to false."
-          ),
-      },
+      inputSchema: getAccountsInput,
       annotations: { readOnlyHint: true },
     },
     async ({ includeHidden }) => {
       try {
-        const client = await getMonarchClient();
-        const data = await client.accounts.getAll({
-          includeHidden: includeHidden ?? false,
+        return await withMonarchClient(async (client) => {
+          const data = await client.accounts.getAll({
+            includeHidden: includeHidden ?? false,
+          });
+          return jsonResult(data);
         });
-        return {
-          content: [
-            { type: "text" as const, text: JSON.stringify(data, null, 2) },
-          ],
-        };
       } catch (error) {
-        const message =
-          error instanceof Error ? error.message : String(error);
-        return {
-          content: [{ type: "text" as const, text: `Error: ${message}` }],
-          isError: true,
-        };
+        return errorResult(error);
       }
     }
   );
@@ -45,47 +60,21 @@ export function registerAccountTools(server: McpServer) {
     {
       description:
         "Get the balance history for a specific account over time. Returns a time series of balance snapshots useful for charting account growth, tracking debt payoff progress, or analyzing balance trends. Requires an account ID which can be obtained from get_accounts.",
-      inputSchema: {
-        accountId: z
-          .string()
-          .describe(
-            "The unique identifier of the account to get history for. Obtain this from get_accounts."
-          ),
-        startDate: z
-          .string()
-          .optional()
-          .describe(
-            "Start date for the history range in YYYY-MM-DD format. Defaults to the earliest available data."
-          ),
-        endDate: z
-          .string()
-          .optional()
-          .describe(
-            "End date for the history range in YYYY-MM-DD format. Defaults to today."
-          ),
-      },
+      inputSchema: getAccountHistoryInput,
       annotations: { readOnlyHint: true },
     },
     async ({ accountId, startDate, endDate }) => {
       try {
-        const client = await getMonarchClient();
-        const data = await client.accounts.getHistory(
-          accountId,
-          startDate,
-          endDate
-        );
-        return {
-          content: [
-            { type: "text" as const, text: JSON.stringify(data, null, 2) },
-          ],
-        };
+        return await withMonarchClient(async (client) => {
+          const data = await client.accounts.getHistory(
+            accountId,
+            startDate,
+            endDate
+          );
+          return jsonResult(data);
+        });
       } catch (error) {
-        const message =
-          error instanceof Error ? error.message : String(error);
-        return {
-          content: [{ type: "text" as const, text: `Error: ${message}` }],
-          isError: true,
-        };
+        return errorResult(error);
       }
     }
   );
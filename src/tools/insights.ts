@@ -1,6 +1,22 @@
 import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import { z } from "zod";
-import { getMonarchClient } from "../monarch/client.js";
+import { withMonarchClient } from "../monarch/client.js";
+import { jsonResult, errorResult } from "./response.js";
+
+const getNetWorthHistoryInput = {
+  startDate: z
+    .string()
+    .optional()
+    .describe(
+      "Start date for the history range in YYYY-MM-DD format. Defaults to the earliest available data."
+    ),
+  endDate: z
+    .string()
+    .optional()
+    .describe(
+      "End date for the history range in YYYY-MM-DD format. Defaults to today."
+    ),
+};
 
 export function registerInsightTools(server: McpServer) {
   server.registerTool(
@@ -12,24 +28,16 @@ export function registerInsightTools(server: McpServer) {
     },
     async () => {
       try {
-        const client = await getMonarchClient();
-        const today = new Date().toISOString().split("T")[0];
-        const data = await client.insights.getNetWorthHistory({
-          startDate: today,
-          endDate: today,
+        return await withMonarchClient(async (client) => {
+          const today = new Date().toISOString().slice(0, 10);
+          const data = await client.insights.getNetWorthHistory({
+            startDate: today,
+            endDate: today,
+          });
+          return jsonResult(data);
         });
-        return {
-          content: [
-            { type: "text" as const, text: JSON.stringify(data, null, 2) },
-          ],
-        };
       } catch (error) {
-        const message =
-          error instanceof Error ? error.message : String(error);
-        return {
-          content: [{ type: "text" as const, text: `Error: ${message}` }],
-          isError: true,
-        };
+        return errorResult(error);
       }
     }
   );
@@ -39,41 +47,20 @@ export function registerInsightTools(server: McpServer) {
     {
       description:
         "Get net worth history over a date range showing how total assets, liabilities, and net worth have changed over time. Returns a time series of data points useful for charting net worth growth, identifying trends, or measuring progress toward financial goals.",
-      inputSchema: {
-        startDate: z
-          .string()
-          .optional()
-          .describe(
-            "Start date for the history range in YYYY-MM-DD format. Defaults to the earliest available data."
-          ),
-        endDate: z
-          .string()
-          .optional()
-          .describe(
-            "End date for the history range in YYYY-MM-DD format. Defaults to today."
-          ),
-      },
+      inputSchema: getNetWorthHistoryInput,
       annotations: { readOnlyHint: true },
     },
     async ({ startDate, endDate }) => {
       try {
-        const client = await getMonarchClient();
-        const data = await client.insights.getNetWorthHistory({
-          startDate,
-          endDate,
+        return await withMonarchClient(async (client) => {
+          const data = await client.insights.getNetWorthHistory({
+            startDate,
+            endDate,
+          });
+          return jsonResult(data);
         });
-        return {
-          content: [
-            { type: "text" as const, text: JSON.stringify(data, null, 2) },
-          ],
-        };
       } catch (error) {
-        const message =
-          error instanceof Error ? error.message : String(error);
-        return {
-          content: [{ type: "text" as const, text: `Error: ${message}` }],
-          isError: true,
-        };
+        return errorResult(error);
       }
     }
   );
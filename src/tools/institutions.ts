@@ -1,5 +1,6 @@
 import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
-import { getMonarchClient } from "../monarch/client.js";
+import { withMonarchClient } from "../monarch/client.js";
+import { jsonResult, errorResult } from "./response.js";
 
 export function registerInstitutionTools(server: McpServer) {
   server.registerTool(
@@ -11,20 +12,12 @@ export function registerInstitutionTools(server: McpServer) {
     },
     async () => {
       try {
-        const client = await getMonarchClient();
-        const data = await client.institutions.getInstitutions();
-        return {
-          content: [
-            { type: "text" as const, text: JSON.stringify(data, null, 2) },
-          ],
-        };
+        return await withMonarchClient(async (client) => {
+          const data = await client.institutions.getInstitutions();
+          return jsonResult(data);
+        });
       } catch (error) {
-        const message =
-          error instanceof Error ? error.message : String(error);
-        return {
-          content: [{ type: "text" as const, text: `Error: ${message}` }],
-          isError: true,
-        };
+        return errorResult(error);
       }
     }
   );
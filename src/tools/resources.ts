@@ -1,5 +1,5 @@
 import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
-import { getMonarchClient } from "../monarch/client.js";
+import { withMonarchClient } from "../monarch/client.js";
 
 export function registerResources(server: McpServer) {
   server.registerResource(
@@ -7,17 +7,18 @@ export function registerResources(server: McpServer) {
     "finance://accounts",
     { description: "All linked financial accounts with current balances" },
     async (uri) => {
-      const client = await getMonarchClient();
-      const accounts = await client.accounts.getAll();
-      return {
-        contents: [
-          {
-            uri: uri.href,
-            mimeType: "application/json",
-            text: JSON.stringify(accounts, null, 2),
-          },
-        ],
-      };
+      return withMonarchClient(async (client) => {
+        const accounts = await client.accounts.getAll();
+        return {
+          contents: [
+            {
+              uri: uri.href,
+              mimeType: "application/json",
+              text: JSON.stringify(accounts),
+            },
+          ],
+        };
+      });
     }
   );
 
@@ -26,45 +27,48 @@ export function registerResources(server: McpServer) {
     "finance://net-worth",
     { description: "Net worth snapshot with asset/liability breakdown and history" },
     async (uri) => {
-      const client = await getMonarchClient();
-      const accounts = await client.accounts.getAll();
-      const netWorthHistory = await client.accounts.getNetWorthHistory();
+      return withMonarchClient(async (client) => {
+        const [accounts, netWorthHistory] = await Promise.all([
+          client.accounts.getAll(),
+          client.accounts.getNetWorthHistory(),
+        ]);
 
-      const liabilityTypes = new Set(["credit", "loan", "liability", "mortgage"]);
+        const liabilityTypes = new Set(["credit", "loan", "liability", "mortgage"]);
 
-      const totalAssets = accounts
-        .filter((a: any) => !liabilityTypes.has(a.type?.name ?? a.type))
-        .reduce((sum: number, a: any) => sum + (a.currentBalance ?? 0), 0);
+        const totalAssets = accounts
+          .filter((a: any) => !liabilityTypes.has(a.type?.name ?? a.type))
+          .reduce((sum: number, a: any) => sum + (a.currentBalance ?? 0), 0);
 
-      const totalLiabilities = accounts
-        .filter((a: any) => liabilityTypes.has(a.type?.name ?? a.type))
-        .reduce(
-          (sum: number, a: any) => sum + Math.abs(a.currentBalance ?? 0),
-          0
-        );
+        const totalLiabilities = accounts
+          .filter((a: any) => liabilityTypes.has(a.type?.name ?? a.type))
+          .reduce(
+            (sum: number, a: any) => sum + Math.abs(a.currentBalance ?? 0),
+            0
+          );
 
-      const snapshot = {
-        totalAssets,
-        totalLiabilities,
-        netWorth: totalAssets - totalLiabilities,
-        accountBreakdown: accounts.map((a: any) => ({
-          name: a.displayName ?? a.name,
-          type: a.type,
-          balance: a.currentBalance,
-          institution: a.institution?.name,
-        })),
-        history: netWorthHistory,
-      };
+        const snapshot = {
+          totalAssets,
+          totalLiabilities,
+          netWorth: totalAssets - totalLiabilities,
+          accountBreakdown: accounts.map((a: any) => ({
+            name: a.displayName ?? a.name,
+            type: a.type,
+            balance: a.currentBalance,
+            institution: a.institution?.name,
+          })),
+          history: netWorthHistory,
+        };
 
-      return {
-        contents: [
-          {
-            uri: uri.href,
-            mimeType: "application/json",
-            text: JSON.stringify(snapshot, null, 2),
-          },
-        ],
-      };
+        return {
+          contents: [
+            {
+              uri: uri.href,
+              mimeType: "application/json",
+              text: JSON.stringify(snapshot),
+            },
+          ],
+        };
+      });
     }
   );
 
@@ -73,26 +77,26 @@ export function registerResources(server: McpServer) {
     "finance://budget/current",
     { description: "Current month budget with planned vs actual amounts" },
     async (uri) => {
-      const client = await getMonarchClient();
+      return withMonarchClient(async (client) => {
+        const now = new Date();
+        const startDate = new Date(now.getFullYear(), now.getMonth(), 1);
+        const endDate = new Date(now.getFullYear(), now.getMonth() + 1, 0);
 
-      const now = new Date();
-      const startDate = new Date(now.getFullYear(), now.getMonth(), 1);
-      const endDate = new Date(now.getFullYear(), now.getMonth() + 1, 0);
+        const budgets = await client.budgets.getBudgets({
+          startDate: startDate.toISOString().slice(0, 10),
+          endDate: endDate.toISOString().slice(0, 10),
+        });
 
-      const budgets = await client.budgets.getBudgets({
-        startDate: startDate.toISOString().split("T")[0],
-        endDate: endDate.toISOString().split("T")[0],
+        return {
+          contents: [
+            {
+              uri: uri.href,
+              mimeType: "application/json",
+              text: JSON.stringify(budgets),
+            },
+          ],
+        };
       });
-
-      return {
-        contents: [
-          {
-            uri: uri.href,
-            mimeType: "application/json",
-            text: JSON.stringify(budgets, null, 2),
-          },
-        ],
-      };
     }
   );
 
@@ -101,18 +105,19 @@ export function registerResources(server: McpServer) {
     "finance://subscriptions",
     { description: "All recurring payments and subscription data" },
     async (uri) => {
-      const client = await getMonarchClient();
-      const recurring = await client.recurring.getRecurringStreams();
+      return withMonarchClient(async (client) => {
+        const recurring = await client.recurring.getRecurringStreams();
 
-      return {
-        contents: [
-          {
-            uri: uri.href,
-            mimeType: "application/json",
-            text: JSON.stringify(recurring, null, 2),
-          },
-        ],
-      };
+        return {
+          contents: [
+            {
+              uri: uri.href,
+              mimeType: "application/json",
+              text: JSON.stringify(recurring),
+            },
+          ],
+        };
+      });
     }
   );
 }
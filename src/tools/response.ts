@@ -0,0 +1,15 @@
+/** Wrap a tool's data as a single JSON text block */
+export function jsonResult(data: unknown) {
+  return {
+    content: [{ type: "text" as const, text: JSON.stringify(data) }],
+  };
+}
+
+/** Report a failure back to the AI instead of throwing */
+export function errorResult(error: unknown) {
+  const message = error instanceof Error ? error.message : String(error);
+  return {
+    content: [{ type: "text" as const, text: `Error: ${message}` }],
+    isError: true,
+  };
+}